@@ -16,6 +16,8 @@
         "views/res_config_settings_view.xml",
         "views/meilisearch_index_views.xml",
         "views/meilisearch_task_views.xml",
+        "views/meilisearch_queue_views.xml",
+        "views/meilisearch_event_views.xml",
         "views/meilisearch_document_views.xml",
         "views/res_country_views.xml",
     ],
@@ -1,9 +1,8 @@
 import gzip
-import json
 import logging
 from io import BytesIO
 
-from werkzeug.exceptions import NotFound
+from werkzeug.exceptions import BadRequest, NotFound
 
 from odoo import http
 from odoo.http import request
@@ -22,41 +21,42 @@ class MeilissearchController(http.Controller):
     def meilisearch_task_webhook(self, **kwargs):
         if request.httprequest.method == "POST" and request.httprequest.data:
 
-            # Decode compressed ndjson
+            # Decode and validate compressed ndjson
+            Event = request.env["meilisearch.event"].sudo()
             compressed_data = request.httprequest.data
-            with gzip.GzipFile(fileobj=BytesIO(compressed_data)) as gz:
-                decompressed_data = gz.read()
-            data_str = decompressed_data.decode("utf-8")
+            try:
+                with gzip.GzipFile(fileobj=BytesIO(compressed_data)) as gz:
+                    decompressed_data = gz.read()
+                data_str = decompressed_data.decode("utf-8")
+                Event._parse_payload(data_str)
+            except (OSError, EOFError, ValueError) as e:
+                _logger.warning("Invalid data from meilisearch task webhook: %s", e)
+                raise BadRequest() from None
             _logger.debug("Received data from meilisearch task webhook: %s", data_str)
-            ndjson_lines = data_str.strip().split("\n")
-            for line in ndjson_lines:
-                data = json.loads(line)
-
-                # Get task by uid
-                task = (
-                    request.env["meilisearch.task"]
-                    .sudo()
-                    .search([("uid", "=", data["uid"])])
-                )
-                # _logger.warning(
-                #     [
-                #         "webhook",
-                #         data["uid"],
-                #         task,
-                #         request.env["meilisearch.task"]
-                #         .sudo()
-                #         .search([], limit=10)
-                #         .mapped("uid"),
-                #     ]
-                # )
-
-                if task:
-                    if data["status"] == "succeeded":
-                        task.task_succeeded()
-                    elif data["status"] == "failed":
-                        task.task_failed()
-                else:
-                    raise NotFound()
+
+            # Store the data and process it in the background
+            Event._create_from_webhook(data_str)
 
         elif request.httprequest.method == "GET":
             return "Send me a POST request to this endpoint."
+
+    @http.route("/meilisearch/search/<string:index_name>", type="json", auth="user")
+    def meilisearch_search(self, index_name, query="", limit=20, offset=0, **kwargs):
+        index = (
+            request.env["meilisearch.index"]
+            .sudo()
+            .search(
+                [
+                    ("index_name", "=", index_name),
+                    ("search_api", "=", True),
+                    ("active", "=", True),
+                    "|",
+                    ("database_filter", "=", False),
+                    ("database_filter", "=", request.env.cr.dbname),
+                ],
+                limit=1,
+            )
+        )
+        if not index:
+            raise NotFound()
+        return index.with_user(request.env.user)._search_api(query, limit, offset)
@@ -1,5 +1,8 @@
 from . import res_config_settings
+from . import helper
 from . import meilisearch_task
+from . import meilisearch_event
 from . import meilisearch_index
+from . import meilisearch_queue
 from . import meilisearch_document_mixin
 from . import res_country
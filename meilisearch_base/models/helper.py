@@ -0,0 +1,103 @@
+import threading
+import time
+
+import meilisearch
+import requests
+from meilisearch.errors import MeilisearchApiError
+from meilisearch.models.task import TaskInfo
+from requests.adapters import HTTPAdapter
+
+from odoo.tools.lru import LRU
+
+POOL_SIZE = 16
+TIMEOUT = 10
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL = 60
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _use_session(http, session):
+    """Send the requests of a Meilisearch http handler with the session."""
+    send_request = http.send_request
+
+    def send_session_request(http_method, *args, **kwargs):
+        return send_request(getattr(session, http_method.__name__), *args, **kwargs)
+
+    http.send_request = send_session_request
+
+
+class PooledClient(meilisearch.Client):
+    """Meilisearch client that keeps the connections alive."""
+
+    def __init__(self, url, api_key, timeout=TIMEOUT):
+        super().__init__(url=url, api_key=api_key, timeout=timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        _use_session(self.http, self.session)
+        if hasattr(self, "task_handler"):
+            _use_session(self.task_handler.http, self.session)
+
+    def index(self, uid):
+        index = super().index(uid)
+        _use_session(index.http, self.session)
+        if hasattr(index, "task_handler"):
+            _use_session(index.task_handler.http, self.session)
+        return index
+
+    def update_documents_gzip(self, index_name, payload):
+        """Add or update documents from a gzip compressed NDJSON payload."""
+        response = self.session.put(
+            f"{self.config.url}/indexes/{index_name}/documents",
+            data=payload,
+            headers={
+                "Authorization": f"Bearer {self.config.api_key}",
+                "Content-Type": "application/x-ndjson",
+                "Content-Encoding": "gzip",
+            },
+            timeout=self.config.timeout,
+        )
+        if not response.ok:
+            raise MeilisearchApiError(response.text, response)
+        return TaskInfo(**response.json())
+
+    def close(self):
+        self.session.close()
+
+
+def get_cached_client(url, api_key):
+    """Return the client of this process for the url and API key."""
+    key = (url, api_key)
+    client = _clients.get(key)
+    if client:
+        return client
+    with _clients_lock:
+        if key not in _clients:
+            # Close clients of the url with an outdated API key
+            for other_key in [k for k in _clients if k[0] == url]:
+                _clients.pop(other_key).close()
+            _clients[key] = PooledClient(url, api_key)
+        return _clients[key]
+
+
+class SearchCache:
+    """LRU cache of search results that expire after a number of seconds."""
+
+    def __init__(self, size=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL):
+        self.ttl = ttl
+        self._results = LRU(size)
+
+    def get(self, key):
+        entry = self._results.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def set(self, key, value):
+        self._results[key] = (time.monotonic() + self.ttl, value)
+
+
+search_cache = SearchCache()
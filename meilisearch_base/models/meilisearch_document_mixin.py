@@ -1,10 +1,17 @@
 import datetime
+import gzip
+import hashlib
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 
 import pytz
+from psycopg2 import sql
 
 from odoo import api, fields, models
+from odoo.osv import expression
+from odoo.tools import split_every
 
 _logger = logging.getLogger(__name__)
 
@@ -34,6 +41,7 @@ class MeilsearchDocumentMixin(models.AbstractModel):
         ]
     )
     index_response = fields.Text(help="Response from Meilisearch index.")
+    index_digest = fields.Char(help="Hash of the document last sent to Meilisearch.")
 
     def button_view_document(self):
         return {
@@ -48,95 +56,410 @@ class MeilsearchDocumentMixin(models.AbstractModel):
             },
         }
 
+    def button_view_tasks(self):
+        self.ensure_one()
+        index = self.env["meilisearch.index"].get_matching_index(model=self._name)
+        tasks = self.env["meilisearch.task"]._get_document_tasks(index, self.id)
+        return {
+            "name": "Document Tasks",
+            "type": "ir.actions.act_window",
+            "view_mode": "tree,form",
+            "views": [(False, "tree"), (False, "form")],
+            "res_model": "meilisearch.task",
+            "domain": [("id", "in", tasks.ids)],
+        }
+
     def documents_indexed(self, response):
-        self.write({"index_result": "indexed", "index_response": response})
+        self._write_index_results(
+            {"index_result": "indexed", "index_response": str(response)}
+        )
 
     def check_index_document(self):
         return self._get_documents()
 
     def update_index_document(self):
-        return self._compute_index_document()
+        return self.with_context(
+            meilisearch_force_update=True
+        )._compute_index_document()
 
     def delete_index_document(self):
         return self._delete_documents()
 
+    def write(self, vals):
+        if all(name.startswith("index_") for name in vals):
+            return super().write(vals)
+
+        # Compare the records of each index before and after the write
+        indexes = self.env["meilisearch.index"].get_matching_indexes(model=self._name)
+        old_records = {index: self._filter_index_documents(index) for index in indexes}
+        res = super().write(vals)
+        for index in indexes:
+            new_records = self._filter_index_documents(index)
+            entered_records = (new_records - old_records[index]).filtered("id")
+            if entered_records:
+                entered_records._compute_index_document()
+                index._enqueue_documents(entered_records)
+            left_records = old_records[index] - new_records
+            if left_records:
+                left_records._enqueue_document_deletion(index)
+        return res
+
     def unlink(self):
-        self._delete_documents()
+        for index in self.env["meilisearch.index"].get_matching_indexes(
+            model=self._name
+        ):
+            index._enqueue_documents(
+                self._filter_index_documents(index), operation="delete"
+            )
         return super().unlink()
 
+    @api.model
+    def _name_search(
+        self, name, args=None, operator="ilike", limit=100, name_get_uid=None
+    ):
+        ids = self._name_search_index(name, args, operator, limit, name_get_uid)
+        if ids is None:
+            return super()._name_search(name, args, operator, limit, name_get_uid)
+        return ids
+
+    @api.model
+    def _name_search_index(
+        self, name, args=None, operator="ilike", limit=100, name_get_uid=None
+    ):
+        """Return the ids matching the name by relevance or None to use SQL."""
+        index = self._get_search_index("name_search")
+        if not index or not name or operator != "ilike":
+            return None
+        try:
+            document_ids = index._search_document_ids(name)
+        except Exception as e:
+            _logger.warning("Meilisearch name search failed, using SQL: %s", e)
+            return None
+
+        # Apply the domain and access rules and keep the relevance order
+        domain = expression.AND([args or [], [("id", "in", document_ids)]])
+        found_ids = set(self._search(domain, access_rights_uid=name_get_uid))
+        ids = [res_id for res_id in document_ids if res_id in found_ids]
+        return ids[:limit] if limit else ids
+
+    @api.model
+    def web_search_read(
+        self,
+        domain=None,
+        fields=None,
+        offset=0,
+        limit=None,
+        order=None,
+        count_limit=None,
+    ):
+        return super().web_search_read(
+            self._get_index_search_domain(domain),
+            fields,
+            offset,
+            limit,
+            order,
+            count_limit,
+        )
+
+    @api.model
+    def web_read_group(self, domain, fields, groupby, *args, **kwargs):
+        return super().web_read_group(
+            self._get_index_search_domain(domain), fields, groupby, *args, **kwargs
+        )
+
+    @api.model
+    def _get_search_index(self, option):
+        """Return the first matching index with the search option enabled."""
+        indexes = self.env["meilisearch.index"].sudo().get_matching_indexes(self._name)
+        return indexes.filtered(option)[:1]
+
+    @api.model
+    def _get_index_search_domain(self, domain):
+        """Replace name conditions of the domain with the matching document ids."""
+        index = self._get_search_index("full_text_search")
+        if not index or not domain:
+            return domain
+        index_domain = []
+        for leaf in domain:
+            if (
+                isinstance(leaf, (list, tuple))
+                and len(leaf) == 3
+                and leaf[0] == self._rec_name
+                and leaf[1] == "ilike"
+                and leaf[2]
+                and isinstance(leaf[2], str)
+            ):
+                try:
+                    # Keep the name condition if the matches exceed the limit
+                    document_ids = index._search_document_ids(leaf[2], complete=True)
+                    if document_ids is not None:
+                        leaf = ("id", "in", document_ids)
+                except Exception as e:
+                    _logger.warning("Meilisearch search failed, using SQL: %s", e)
+            index_domain.append(leaf)
+        return index_domain
+
     def _prepare_index_document(self):
         self.ensure_one()
         return {"id": self.id, "name": self.name}
 
+    def _prepare_index_documents(self):
+        """Return the documents of the records by record id."""
+        return {record.id: record._prepare_index_document() for record in self}
+
     def _get_index_document_filter(self):
+        """Return a function to filter the records in Python."""
         return lambda r: True
 
+    def _has_index_document_filter(self):
+        """Return whether the records are filtered in Python."""
+        # The records can be searched in SQL unless the filter is overridden
+        return (
+            type(self)._get_index_document_filter
+            is not MeilsearchDocumentMixin._get_index_document_filter
+        )
+
+    def _get_index_document_domain(self):
+        """Return the domain of the records that should be indexed."""
+        return []
+
+    def _filter_index_documents(self, index=None):
+        """Return the records of this recordset that should be indexed."""
+        records = self.filtered_domain(self._get_index_document_domain())
+        if self._has_index_document_filter():
+            records = records.filtered(self._get_index_document_filter())
+        if index:
+            records = records.filtered_domain(index._get_index_domain())
+        return records
+
     @api.depends("name")
     def _compute_index_document(self):
-        index = self.env["meilisearch.index"].get_matching_index(model=self[:0]._name)
+        indexes = self.env["meilisearch.index"].get_matching_indexes(
+            model=self[:0]._name
+        )
 
         # Filter all records that should be indexed
-        index_records = self.filtered(self._get_index_document_filter())
+        index_records = self._filter_index_documents()
 
-        # Update Meilisearch document
+        # Update Meilisearch document and collect the changed ones
+        force_update = self.env.context.get("meilisearch_force_update")
+        changed_ids = []
+        documents = index_records._prepare_index_documents()
         for record in index_records:
-            document = record._prepare_index_document()
+            document = documents[record.id]
             record.index_document = document
+            if (
+                force_update
+                or record.index_result not in ("queued", "indexed")
+                or record.index_digest != self._get_index_document_digest(document)
+            ):
+                changed_ids.append(record.id)
 
-        # Create update task
-        if index:
-            index_records._update_documents(index)
-
-        # Get documents that are indexed and no longer match with filter
-        delete_records = (
-            self.filtered(lambda d: d.index_result == "indexed") - index_records
-        )
-        if delete_records:
-            delete_records._delete_documents()
+        # Queue documents for the update of each index
+        changed_records = self.browse(changed_ids).filtered("id")
+        for index in indexes:
+            # Documents prepared for the index may change without the stored one
+            records = changed_records
+            if not index._uses_stored_documents():
+                records = index_records.filtered("id")
+            index._enqueue_documents(records.filtered_domain(index._get_index_domain()))
 
     def _compute_index_document_read(self):
         for record in self:
             record.index_document_read = json.dumps(record.index_document, indent=4)
 
+    @api.model
+    def _get_index_document_digest(self, document):
+        """Return a hash of the document content."""
+        data = json.dumps(document, sort_keys=True, default=str)
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
     def _get_batches(self, batch_size=0):
         if not batch_size:
             batch_size = self._batch_size
         for i in range(0, len(self), batch_size):
             yield self[i : i + batch_size]
 
-    def _update_documents(self, index):
+    def _iter_index_document_rows(self, index=None):
+        """Yield id and JSON text of the documents for the index."""
+        if index and not index._uses_stored_documents():
+            for records in split_every(models.PREFETCH_MAX, self.ids, self.browse):
+                documents = records.with_context(
+                    lang=index.lang, meilisearch_index_id=index.id
+                )._prepare_index_documents()
+                for res_id in records.ids:
+                    yield res_id, json.dumps(documents[res_id])
+            return
+
+        # Read the stored documents from the database
+        self.flush_recordset(["index_document"])
+        query = sql.SQL(
+            "SELECT id, index_document::text FROM {} "
+            "WHERE id IN %s AND index_document IS NOT NULL ORDER BY id"
+        ).format(sql.Identifier(self._table))
+        for ids in split_every(models.PREFETCH_MAX, self.ids):
+            self.env.cr.execute(query, [ids])
+            yield from self.env.cr.fetchall()
+
+    def _prepare_update_batch(self, rows):
+        """Return the records, the gzip compressed NDJSON payload and the digests."""
+        buffer = BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as payload:
+            for _res_id, document in rows:
+                payload.write(document.encode("utf-8") + b"\n")
+        digests = [
+            self._get_index_document_digest(json.loads(document))
+            for _res_id, document in rows
+        ]
+        records = self.browse([res_id for res_id, _document in rows])
+        return records, buffer.getvalue(), digests
+
+    def _get_update_batches(self, index, rows=None, batch_size=0):
+        """Yield the update batches limited by document count and payload size."""
+        batch_size = batch_size or index.batch_size or self._batch_size
+        if rows is None:
+            rows = self._iter_index_document_rows(index)
+        batch_rows, payload_size = [], 0
+        for res_id, document in rows:
+            if batch_rows and (
+                len(batch_rows) >= batch_size
+                or (
+                    index.batch_max_bytes
+                    and payload_size + len(document) > index.batch_max_bytes
+                )
+            ):
+                yield self._prepare_update_batch(batch_rows)
+                batch_rows, payload_size = [], 0
+            batch_rows.append((res_id, document))
+            payload_size += len(document)
+        if batch_rows:
+            yield self._prepare_update_batch(batch_rows)
+
+    def _write_index_digests(self, digests):
+        """Store the digests of the sent documents without loading the records."""
+        query = sql.SQL(
+            "UPDATE {} AS record SET index_digest = sent.digest "
+            "FROM unnest(%s, %s) AS sent(id, digest) WHERE record.id = sent.id"
+        ).format(sql.Identifier(self._table))
+        self.env.cr.execute(query, [self.ids, digests])
+        self.invalidate_recordset(["index_digest"])
+
+    def _write_index_documents(self, documents):
+        """Store the documents by record id without updating the write date."""
+        self.flush_recordset(["index_document"])
+        query = sql.SQL(
+            "UPDATE {} AS record SET index_document = new.document::jsonb "
+            "FROM unnest(%s, %s) AS new(id, document) WHERE record.id = new.id"
+        ).format(sql.Identifier(self._table))
+        values = [json.dumps(document) for document in documents.values()]
+        self.env.cr.execute(query, [list(documents), values])
+        self.invalidate_recordset(["index_document"])
+
+    def _sync_index_documents(self, index):
+        """Store the changed documents and queue them for the index."""
+        digest = self._get_index_document_digest
+        records = self._filter_index_documents(index)
+        documents = records._prepare_index_documents()
+        changed_documents = {}
+        queue_ids = []
+        for record in records:
+            document = documents[record.id]
+            if digest(document) != digest(record.index_document):
+                changed_documents[record.id] = document
+            if (
+                not index._uses_stored_documents()
+                or record.index_result not in ("queued", "indexed")
+                or record.index_digest != digest(document)
+            ):
+                queue_ids.append(record.id)
+        if changed_documents:
+            self.browse(list(changed_documents))._write_index_documents(
+                changed_documents
+            )
+        index._enqueue_documents(self.browse(queue_ids))
+
+    def _write_index_results(self, vals):
+        """Store the index result without updating the write date of the records."""
+        self.flush_recordset(list(vals))
+        query = sql.SQL("UPDATE {} SET {} WHERE id = ANY(%s)").format(
+            sql.Identifier(self._table),
+            sql.SQL(", ").join(
+                [sql.SQL("{} = %s").format(sql.Identifier(name)) for name in vals]
+            ),
+        )
+        self.env.cr.execute(query, [*vals.values(), self.ids])
+        self.invalidate_recordset(list(vals))
+
+    def _clear_index_digests(self):
+        """Reset the digests so that the documents are sent again."""
+        self.flush_recordset(["index_digest"])
+        query = sql.SQL(
+            "UPDATE {} SET index_digest = NULL WHERE id = ANY(%s)"
+        ).format(sql.Identifier(self._table))
+        self.env.cr.execute(query, [self.ids])
+        self.invalidate_recordset(["index_digest"])
+
+    def _update_documents(self, index, rows=None):
+        """Send the documents to the index and return the records that failed."""
         client = index.get_client()
+        if not client:
+            self._write_index_results(
+                {"index_result": "no_index", "index_response": "Index not found"}
+            )
+            return self
 
-        for batch in self._get_batches():
-            if client:
-                try:
-                    res = client.index(index.index_name).update_documents(
-                        [self.index_document for self in batch]
-                    )
-                    if index.create_task:
-                        self.env["meilisearch.task"].create(
-                            {
-                                "name": "documentAdditionOrUpdate",
-                                "index_id": index.id,
-                                "uid": res.task_uid,
-                                "document_ids": [rec.id for rec in batch],
-                            }
-                        )
-                    batch.update(
-                        {
-                            "index_result": "queued",
-                            "index_response": "Task enqueued",
-                            "index_date": res.enqueued_at,
-                        }
-                    )
-                    if index.create_task:
-                        self.env.cr.commit()  # Commit changes so the task can be accessed by the webhook controller
-                except Exception as e:
-                    batch.write({"index_result": "error", "index_response": e})
-            else:
-                batch.write(
-                    {"index_result": "no_index", "index_response": "Index not found"}
+        # Read the index name here as the threads must not use the cursor
+        index_name = index.index_name
+
+        def send_documents(payload):
+            return client.update_documents_gzip(index_name, payload)
+
+        # Send the batches concurrently and apply the results on this cursor
+        failed_records = self.browse()
+        max_workers = max(index.upload_concurrency, 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for batches in split_every(
+                max_workers * 2, self._get_update_batches(index, rows)
+            ):
+                results = [
+                    (batch, pool.submit(send_documents, payload), digests)
+                    for batch, payload, digests in batches
+                ]
+                failed_records |= self._apply_update_results(index, results)
+        if index.create_task:
+            self.env.cr.commit()  # Commit changes so the task can be accessed by the webhook controller
+        return failed_records
+
+    def _apply_update_results(self, index, results):
+        failed_records = self.browse()
+        for batch, future, digests in results:
+            try:
+                res = future.result()
+            except Exception as e:
+                batch._write_index_results(
+                    {"index_result": "error", "index_response": str(e)}
                 )
+                failed_records |= batch
+                continue
+            if index.create_task:
+                self.env["meilisearch.task"].create(
+                    {
+                        "name": "documentAdditionOrUpdate",
+                        "index_id": index.id,
+                        "uid": res.task_uid,
+                        "document_ids": [rec.id for rec in batch],
+                    }
+                )
+            batch._write_index_results(
+                {
+                    "index_result": "queued",
+                    "index_response": "Task enqueued",
+                    "index_date": res.enqueued_at,
+                }
+            )
+            if index._uses_stored_documents():
+                batch._write_index_digests(digests)
+        return failed_records
 
     def _get_documents(self):
         index = self.env["meilisearch.index"].get_matching_index(model=self[:0]._name)
@@ -161,63 +484,52 @@ class MeilsearchDocumentMixin(models.AbstractModel):
 
                         # Update records not in hits set
                         not_found = batch.filtered(lambda r: r.id not in found_ids)
-                        not_found.write(
+                        not_found._write_index_results(
                             {
                                 "index_result": "not_found",
                                 "index_response": "Document not found",
                             }
                         )
                     else:
-                        batch.update(
+                        batch._write_index_results(
                             {
                                 "index_result": "not_found",
-                                "index_response": res,
+                                "index_response": str(res),
                             }
                         )
                 except Exception as e:
-                    batch.write({"index_result": "error", "index_response": e})
+                    batch._write_index_results(
+                        {"index_result": "error", "index_response": str(e)}
+                    )
             else:
-                batch.write(
+                batch._write_index_results(
                     {"index_result": "no_index", "index_response": "Index not found"}
                 )
 
-    def _delete_documents(self):
-        index = self.env["meilisearch.index"].get_matching_index(model=self[:0]._name)
-        client = index.get_client()
+    def _enqueue_document_deletion(self, indexes=None):
+        """Queue the deletion of the documents and return the indexes."""
+        if indexes is None:
+            indexes = self.env["meilisearch.index"].get_matching_indexes(
+                model=self[:0]._name
+            )
+        for index in indexes:
+            index._enqueue_documents(self, operation="delete")
+        # Send the documents again when they match the filter again
+        self._clear_index_digests()
+        return indexes
 
-        for batch in self._get_batches():
-            if client:
-                try:
-                    search_filter = (
-                        f"{' OR '.join(['id='+str(rec.id) for rec in batch])}"
-                    )
-                    res = client.index(index.index_name).delete_documents(
-                        filter=search_filter
-                    )
-                    if index.create_task:
-                        self.env["meilisearch.task"].create(
-                            {
-                                "name": "documentDeletion",
-                                "index_id": index.id,
-                                "uid": res.task_uid,
-                                "document_ids": [rec.id for rec in batch],
-                            }
-                        )
-                    batch.update(
-                        {
-                            "index_result": "queued",
-                            "index_response": "Task enqueued",
-                            "index_date": res.enqueued_at,
-                        }
-                    )
-                    if index.create_task:
-                        self.env.cr.commit()  # Commit changes so the task can be accessed by the webhook controller
-                except Exception as e:
-                    batch.write({"index_result": "error", "index_response": e})
-            else:
-                batch.write(
-                    {"index_result": "no_index", "index_response": "Index not found"}
-                )
+    def _delete_documents(self, indexes=None):
+        if self._enqueue_document_deletion(indexes):
+            self._write_index_results(
+                {"index_result": "queued", "index_response": "Deletion queued"}
+            )
+        else:
+            self._write_index_results(
+                {
+                    "index_result": "no_index",
+                    "index_response": "Index not found",
+                }
+            )
 
     def _convert_to_timestamp(self, dt, tz=pytz.UTC):
         if not dt:
@@ -0,0 +1,137 @@
+import json
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+
+class MeilisearchEvent(models.Model):
+    _name = "meilisearch.event"
+    _description = "Meilisearch Event"
+    _order = "id desc"
+    _batch_size = 100
+    _max_attempts = 10
+
+    payload = fields.Text(required=True, help="NDJSON data of the task webhook.")
+    state = fields.Selection(
+        [
+            ("pending", "Pending"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        default="pending",
+        required=True,
+        index=True,
+    )
+    attempts = fields.Integer()
+    response = fields.Text()
+
+    def name_get(self):
+        return [(event.id, "%s (%s)" % (self._description, event.id)) for event in self]
+
+    @api.model
+    def _create_from_webhook(self, payload):
+        event = self.create({"payload": payload})
+        self.env.ref("meilisearch_base.ir_cron_meilisearch_event")._trigger()
+        return event
+
+    @api.model
+    def _parse_payload(self, payload):
+        """Return the status and line by task uid or raise a ValueError."""
+        lines = {}
+        for line in payload.strip().split("\n"):
+            data = json.loads(line)
+            if not isinstance(data, dict):
+                raise ValueError("Task data must be an object: %s" % line)
+            uid, status = data.get("uid"), data.get("status")
+            if not isinstance(uid, int) or not isinstance(status, str):
+                raise ValueError("Task uid or status missing: %s" % line)
+            lines[uid] = (status, line)
+        return lines
+
+    def _process(self):
+        """Apply the task statuses of the events and keep unknown tasks for later."""
+        for event in self:
+            try:
+                lines = self._parse_payload(event.payload)
+            except ValueError as e:
+                # An invalid payload does not get valid with another attempt
+                event.write(
+                    {
+                        "state": "failed",
+                        "attempts": event.attempts + 1,
+                        "response": str(e),
+                    }
+                )
+                continue
+            try:
+                with self.env.cr.savepoint():
+                    event._process_payload(lines)
+            except Exception as e:
+                # Retry the event later without blocking the following events
+                _logger.warning("Could not process event %s: %s", event.id, e)
+                self.env.invalidate_all()
+                event._retry(str(e))
+
+    def _process_payload(self, lines):
+        self.ensure_one()
+        unknown_uids = self.env["meilisearch.task"]._apply_task_statuses(
+            {uid: status for uid, (status, line) in lines.items()}
+        )
+        if not unknown_uids:
+            self.write({"state": "done", "response": "Event processed"})
+            return
+
+        # Keep the unknown tasks as the task may not be committed yet
+        self._retry(
+            "Tasks not found: %s" % sorted(unknown_uids),
+            payload="\n".join(lines[uid][1] for uid in sorted(unknown_uids)),
+        )
+
+    def _retry(self, response, payload=None):
+        """Keep the event pending until the maximum number of attempts."""
+        self.ensure_one()
+        attempts = self.attempts + 1
+        vals = {
+            "state": "failed" if attempts >= self._max_attempts else "pending",
+            "attempts": attempts,
+            "response": response,
+        }
+        if payload:
+            vals["payload"] = payload
+        self.write(vals)
+
+    @api.model
+    def _cron_process_events(self):
+        last_id = 0
+        while True:
+            # Events that stay pending are retried in the next run
+            events = self.search(
+                [("state", "=", "pending"), ("id", ">", last_id)],
+                order="id",
+                limit=self._batch_size,
+            )
+            if not events:
+                break
+            events._process()
+            last_id = events[-1].id
+            if not self.env.registry.in_test_mode():
+                self.env.cr.commit()  # Commit processed events
+
+    @api.autovacuum
+    def _gc_meilisearch_events(self):
+        """Delete processed events after one day and failed events after a week."""
+        now = fields.Datetime.now()
+        self.search(
+            [
+                "|",
+                "&",
+                ("state", "=", "done"),
+                ("create_date", "<", now - timedelta(days=1)),
+                "&",
+                ("state", "=", "failed"),
+                ("create_date", "<", now - timedelta(days=7)),
+            ]
+        ).unlink()
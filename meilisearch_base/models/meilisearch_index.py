@@ -1,10 +1,15 @@
 import json
 import logging
+from datetime import timedelta
 
-import meilisearch
+from psycopg2 import sql
 
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import UserError
+from odoo.tools import split_every
+from odoo.tools.safe_eval import safe_eval
+
+from .helper import get_cached_client, search_cache
 
 _logger = logging.getLogger(__name__)
 
@@ -13,6 +18,12 @@ class MeilisearchIndex(models.Model):
     _name = "meilisearch.index"
     _description = "Meilisearch Index"
     _order = "sequence, active, id"
+    _bulk_size = 10000
+    _task_timeout = 600000
+    _sync_margin = 300
+    _search_limit = 1000
+    _search_api_limit = 100
+    _rebuild_timeout = 86400
 
     sequence = fields.Integer(default=10)
     active = fields.Boolean(default=False)
@@ -41,7 +52,78 @@ class MeilisearchIndex(models.Model):
         default=True,
         help="Create tasks to track document addition and update.",
     )
+    batch_size = fields.Integer(
+        default=80, help="Maximum number of documents sent in one request."
+    )
+    batch_max_bytes = fields.Integer(
+        string="Batch Max Bytes",
+        default=10000000,
+        help="Maximum payload size of one request. Set to 0 for no limit.",
+    )
+    upload_concurrency = fields.Integer(
+        string="Concurrent Uploads",
+        default=4,
+        help="Number of requests that are sent concurrently.",
+    )
+    document_domain = fields.Char(
+        string="Document Filter",
+        default="[]",
+        help="Only records matching this domain are sent to the index.",
+    )
+    lang = fields.Selection(
+        selection="_get_lang_selection",
+        string="Language",
+        help="Prepare the documents in this language instead of using the stored "
+        "documents.",
+    )
+    name_search = fields.Boolean(
+        help="Search the records of the model by name with this index, e.g. in "
+        "many2one fields.",
+    )
+    full_text_search = fields.Boolean(
+        string="Full-Text Search",
+        help="Search the records by name in list and kanban views with this index. "
+        "Searches with 1000 or more matches use the database.",
+    )
+    search_api = fields.Boolean(
+        string="Search API",
+        help="Allow signed in users to search this index with the "
+        "/meilisearch/search route.",
+    )
+    reconcile_compare_content = fields.Boolean(
+        string="Reconcile Content",
+        help="Compare the content of the documents when reconciling the index.",
+    )
+    task_retention_days = fields.Integer(
+        string="Task Retention (Days)",
+        default=1,
+        help="Delete tasks older than this number of days. Set to 0 to keep them.",
+    )
+    task_retention_count = fields.Integer(
+        string="Max Tasks",
+        help="Delete the oldest tasks exceeding this number. Set to 0 for no limit.",
+    )
     task_ids = fields.One2many("meilisearch.task", "index_id")
+    sync_date = fields.Datetime(
+        string="Last Sync Date",
+        readonly=True,
+        copy=False,
+        default=fields.Datetime.now,
+        help="Write date of the last record checked by the document sync.",
+    )
+    sync_id = fields.Integer(string="Last Sync ID", readonly=True, copy=False)
+    search_version = fields.Integer(
+        default=0,
+        readonly=True,
+        copy=False,
+        help="Increased when the documents change to expire cached search results.",
+    )
+    rebuild_date = fields.Datetime(
+        string="Rebuild Started",
+        readonly=True,
+        copy=False,
+        help="The queue of the index is held while the index is rebuilt.",
+    )
     task_count = fields.Integer(compute="_compute_task_count", store=True)
 
     document_filtered_count = fields.Integer(
@@ -66,6 +148,10 @@ class MeilisearchIndex(models.Model):
         compute="_compute_meilisearch_index_url",
     )
 
+    @api.model
+    def _get_lang_selection(self):
+        return self.env["res.lang"].get_installed()
+
     def _compute_meilisearch_index_url(self):
         for index in self:
             url = (
@@ -79,34 +165,36 @@ class MeilisearchIndex(models.Model):
 
     def _compute_document_count(self):
         for index in self:
-            if index.active:
-                model = self.env[index.model]
-                documents = index._get_all_documents()
-                index.document_filtered_count = len(
-                    documents.filtered(model._get_index_document_filter())
-                )
-                index.document_queued_count = len(
-                    documents.filtered(lambda d: d.index_result == "queued")
-                )
-                index.document_indexed_count = len(
-                    documents.filtered(lambda d: d.index_result == "indexed")
-                )
-                index.document_error_count = len(
-                    documents.filtered(lambda d: d.index_result == "error")
-                )
-                index.document_not_found_count = len(
-                    documents.filtered(lambda d: d.index_result == "not_found")
+            index.document_filtered_count = 0
+            index.document_queued_count = 0
+            index.document_indexed_count = 0
+            index.document_error_count = 0
+            index.document_not_found_count = 0
+            index.document_no_index_count = 0
+            if not index.active:
+                continue
+
+            # Count records matching the document filter in the database
+            model = self.env[index.model]
+            if model._has_index_document_filter():
+                index.document_filtered_count = len(index._search_documents())
+            else:
+                index.document_filtered_count = model.search_count(
+                    index._get_document_domain()
                 )
-                index.document_no_index_count = len(
-                    documents.filtered(lambda d: d.index_result == "no_index")
+
+            # Count records per index result with a single grouped query
+            counts = {
+                group["index_result"]: group["__count"]
+                for group in model.read_group(
+                    [], ["index_result"], ["index_result"], lazy=False
                 )
-            else:
-                index.document_filtered_count = 0
-                index.document_queued_count = 0
-                index.document_indexed_count = 0
-                index.document_error_count = 0
-                index.document_not_found_count = 0
-                index.document_no_index_count = 0
+            }
+            index.document_queued_count = counts.get("queued", 0)
+            index.document_indexed_count = counts.get("indexed", 0)
+            index.document_error_count = counts.get("error", 0)
+            index.document_not_found_count = counts.get("not_found", 0)
+            index.document_no_index_count = counts.get("no_index", 0)
 
     @api.model
     def _cron_check_documents(self):
@@ -122,6 +210,39 @@ class MeilisearchIndex(models.Model):
             _logger.info("Checking documents for index: %s", index.name)
             index.check_all_documents()
 
+    @api.model
+    def _cron_sync_documents(self):
+        # Get all active indexes
+        for index in self.search(
+            [
+                ("active", "=", True),
+                "|",
+                ("database_filter", "=", False),
+                ("database_filter", "=", self._cr.dbname),
+            ]
+        ):
+            _logger.info("Syncing modified documents for index: %s", index.name)
+            index._sync_documents()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.clear_caches()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if {"active", "model_id", "database_filter", "sequence"} & set(vals):
+            self.clear_caches()
+        if "model_id" in vals:
+            # Start the document sync of the new model from now
+            vals = dict(vals, sync_date=fields.Datetime.now(), sync_id=0)
+        if {"index_name", "index_settings"} & set(vals):
+            self._invalidate_search_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        self.clear_caches()
+        return super().unlink()
+
     def copy(self, default=None):
         self.ensure_one()
         default = default or {}
@@ -130,7 +251,7 @@ class MeilisearchIndex(models.Model):
         return super().copy(default)
 
     def get_client(self):
-        """Return the Meilisearch client."""
+        """Return the Meilisearch client of this process."""
         icp = self.env["ir.config_parameter"].sudo()
         url = icp.get_param("meilisearch.api_url")
         api_key = icp.get_param("meilisearch.api_key")
@@ -144,15 +265,19 @@ class MeilisearchIndex(models.Model):
             )
             return
 
-        return meilisearch.Client(
-            url=url,
-            api_key=api_key,
-            timeout=10,
-        )
+        return get_cached_client(url, api_key)
 
     @api.model
     def get_matching_index(self, model):
-        index = self.search(
+        return self.get_matching_indexes(model)[:1]
+
+    @api.model
+    def get_matching_indexes(self, model):
+        return self.browse(self._get_matching_index_ids(model))
+
+    @tools.ormcache("model")
+    def _get_matching_index_ids(self, model):
+        indexes = self.sudo().search(
             [
                 "&",
                 ("active", "=", True),
@@ -163,9 +288,8 @@ class MeilisearchIndex(models.Model):
                 ("database_filter", "=", False),
                 ("database_filter", "=", self._cr.dbname),
             ],
-            limit=1,
         )
-        return index
+        return tuple(indexes.ids)
 
     def button_view_documents(self):
         tree_view_id = self.env.ref("meilisearch_base.document_view_tree")
@@ -217,6 +341,24 @@ class MeilisearchIndex(models.Model):
     def button_update_document_count(self):
         return self._compute_document_count()
 
+    def button_process_queue(self):
+        return self._process_queue()
+
+    def button_reindex_documents(self):
+        return self._reindex_documents()
+
+    def button_sync_documents(self):
+        return self._sync_documents()
+
+    def button_rebuild_index(self):
+        return self._rebuild_index()
+
+    def button_reconcile_documents(self):
+        return self._reconcile_documents()
+
+    def button_reconcile_documents_dry_run(self):
+        return self._reconcile_documents(dry_run=True)
+
     def button_open_meilisearch_index_url(self):
         self.ensure_one()
         return {
@@ -226,8 +368,7 @@ class MeilisearchIndex(models.Model):
         }
 
     def check_all_documents(self):
-        documents = self._get_all_documents()
-        documents._get_documents()
+        self._check_all_documents()
         self._compute_document_count()
 
     def _get_version(self):
@@ -341,12 +482,131 @@ class MeilisearchIndex(models.Model):
                     )
                 ) from None
 
+    def _wait_for_task(self, client, task_info):
+        """Wait until the Meilisearch task is processed and raise if it failed."""
+        task = client.wait_for_task(
+            task_info.task_uid, timeout_in_ms=self._task_timeout
+        )
+        if task.status != "succeeded":
+            raise UserError(_("Meilisearch task %s failed: %s", task.uid, task.error))
+        return task
+
+    def _rebuild_index(self):
+        """Fill a shadow index with all documents and swap it with the index."""
+        self.ensure_one()
+        client = self.get_client()
+        if not client:
+            return
+        model = self.env[self.model]
+        tmp_index_name = f"{self.index_name}_tmp"
+
+        # Hold the queue so that changes made meanwhile are sent after the swap
+        start_date = self.env.cr.now()
+        self._commit_rebuild_date(fields.Datetime.now())
+        try:
+            # Remove the shadow index of a previous rebuild
+            client.wait_for_task(
+                client.delete_index(tmp_index_name).task_uid,
+                timeout_in_ms=self._task_timeout,
+            )
+            self._wait_for_task(
+                client, client.create_index(tmp_index_name, {"primaryKey": "id"})
+            )
+            self._wait_for_task(
+                client,
+                client.index(tmp_index_name).update_settings(
+                    json.loads(self.index_settings)
+                ),
+            )
+
+            # Send all documents in large batches
+            record_ids = []
+            record_digests = []
+            task_infos = []
+            for batch, payload, digests in model._get_update_batches(
+                self, self._export_document_rows(), self._bulk_size
+            ):
+                record_ids += batch.ids
+                record_digests += digests
+                task_infos.append(client.update_documents_gzip(tmp_index_name, payload))
+            for task_info in task_infos:
+                self._wait_for_task(client, task_info)
+
+            # Swap the shadow index with the live index
+            try:
+                client.get_index(self.index_name)
+            except Exception:
+                self._wait_for_task(
+                    client, client.create_index(self.index_name, {"primaryKey": "id"})
+                )
+            self._wait_for_task(
+                client,
+                client.swap_indexes([{"indexes": [self.index_name, tmp_index_name]}]),
+            )
+            client.delete_index(tmp_index_name)
+        except Exception as e:
+            self._commit_rebuild_date(False)
+            raise UserError(
+                _(
+                    "Could not rebuild the Meilisearch index '%s': %s",
+                    self.index_name,
+                    e,
+                )
+            ) from None
+
+        # Store the results in new transactions as records may have changed
+        uses_stored_documents = self._uses_stored_documents()
+        for ids, digests in zip(
+            split_every(self._bulk_size, record_ids, list),
+            split_every(self._bulk_size, record_digests, list),
+        ):
+            with self.env.registry.cursor() as cr:
+                records = model.with_env(self.env(cr=cr)).browse(ids)
+                records.documents_indexed("Index rebuilt")
+                if uses_stored_documents:
+                    records._write_index_digests(digests)
+
+        # Queue the records changed since this transaction took its snapshot
+        with self.env.registry.cursor() as cr:
+            index = self.with_env(self.env(cr=cr))
+            changed_date = start_date - timedelta(seconds=self._sync_margin)
+            changed_records = index.env[index.model].search(
+                [("write_date", ">=", changed_date)]
+            )
+            index._enqueue_documents(changed_records._filter_index_documents(index))
+
+        # Send the changes that were queued during the rebuild
+        with self.env.registry.cursor() as cr:
+            index = self.with_env(self.env(cr=cr))
+            index.write({"rebuild_date": False})
+            index._invalidate_search_cache()
+        self.env.ref("meilisearch_base.ir_cron_meilisearch_queue")._trigger()
+
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Meilisearch Index Rebuilt"),
+                "message": _(
+                    "The Meilisearch index '%s' has been rebuilt.", self.index_name
+                ),
+                "sticky": False,
+                "type": "success",
+            },
+        }
+
+    def _commit_rebuild_date(self, rebuild_date):
+        """Store the rebuild date in a new transaction to hold the queue."""
+        with self.env.registry.cursor() as cr:
+            self.with_env(self.env(cr=cr)).write({"rebuild_date": rebuild_date})
+
     def _delete_index(self):
         self.ensure_one()
         client = self.get_client()
         if client:
             try:
                 client.delete_index(self.index_name)
+                self._invalidate_search_cache()
                 return {
                     "type": "ir.actions.client",
                     "tag": "display_notification",
@@ -368,6 +628,430 @@ class MeilisearchIndex(models.Model):
                     )
                 ) from None
 
+    def _enqueue_documents(self, documents, operation="update"):
+        """Queue the documents for the update or deletion in the Meilisearch index."""
+        self.ensure_one()
+        if not documents:
+            return
+
+        # Collect the document operations until the transaction is committed
+        precommit = self.env.cr.precommit
+        pending = precommit.data.setdefault("meilisearch.queue", {})
+        if not pending:
+            precommit.add(self.env["meilisearch.queue"].sudo()._flush_pending)
+        pending.setdefault(self.id, {}).update(dict.fromkeys(documents.ids, operation))
+
+    def _process_queue(self):
+        """Send the queued documents in batches to the Meilisearch index."""
+        queue = self.env["meilisearch.queue"].sudo()
+        hold_date = fields.Datetime.now() - timedelta(seconds=self._rebuild_timeout)
+        for index in self:
+            # Keep the queue if no client is configured
+            if not index.get_client():
+                continue
+
+            # Keep the queue while the index is rebuilt
+            if index.rebuild_date and index.rebuild_date > hold_date:
+                _logger.info("Holding queue of index %s during rebuild", index.name)
+                continue
+
+            # Delete documents by id in large batches
+            last_id = 0
+            while True:
+                # Entries that could not be deleted are retried in the next run
+                entries = queue.search(
+                    [
+                        ("index_id", "=", index.id),
+                        ("operation", "=", "delete"),
+                        ("id", ">", last_id),
+                    ],
+                    order="id",
+                    limit=index._bulk_size,
+                )
+                if not entries:
+                    break
+                last_id = entries[-1].id
+                try:
+                    with self.env.cr.savepoint():
+                        index._delete_document_ids(
+                            sorted(set(entries.mapped("res_id")))
+                        )
+                except Exception as e:
+                    _logger.warning(
+                        "Could not delete documents of index %s: %s", index.name, e
+                    )
+                    entries._retry()
+                else:
+                    entries.unlink()
+                if not self.env.registry.in_test_mode():
+                    self.env.cr.commit()  # Commit batch so it is not sent twice
+
+            last_id = 0
+            while True:
+                # Entries that could not be sent are retried in the next run
+                entries = queue.search(
+                    [
+                        ("index_id", "=", index.id),
+                        ("operation", "=", "update"),
+                        ("id", ">", last_id),
+                    ],
+                    order="id",
+                    limit=queue._batch_size,
+                )
+                if not entries:
+                    break
+                last_id = entries[-1].id
+                documents = (
+                    self.env[index.model].browse(set(entries.mapped("res_id"))).exists()
+                )
+                failed_ids = set(documents._update_documents(index).ids)
+                failed_entries = entries.filtered(lambda e: e.res_id in failed_ids)
+                failed_entries._retry()
+                (entries - failed_entries).unlink()
+                if not self.env.registry.in_test_mode():
+                    self.env.cr.commit()  # Commit batch so it is not sent twice
+
+    def _iter_documents(self, fields=None):
+        """Yield the documents of the Meilisearch index page by page."""
+        self.ensure_one()
+        index = self.get_client().index(self.index_name)
+        offset = 0
+        while True:
+            params = {"offset": offset, "limit": self._bulk_size}
+            if fields:
+                params["fields"] = fields
+            res = index.get_documents(params)
+            yield from res.results
+            offset += len(res.results)
+            if not res.results or offset >= res.total:
+                break
+
+    def _get_document_ids(self):
+        """Return the ids of all documents in the Meilisearch index."""
+        return {int(document.id) for document in self._iter_documents(["id"])}
+
+    def _export_document_rows(self):
+        """Yield id and JSON text of all documents ordered by id."""
+        self.ensure_one()
+        model = self.env[self.model]
+        if model._has_index_document_filter() or not self._uses_stored_documents():
+            yield from self._search_documents()._iter_index_document_rows(self)
+            return
+
+        # Page through the table by id to bypass the record cache
+        model.flush_model(["index_document"])
+        query = model._where_calc(self._get_document_domain())
+        from_clause, where_clause, params = query.get_sql()
+        statement = f"""
+            SELECT "{model._table}".id, "{model._table}".index_document::text
+            FROM {from_clause}
+            WHERE {where_clause or "TRUE"}
+            AND "{model._table}".index_document IS NOT NULL
+            AND "{model._table}".id > %s
+            ORDER BY "{model._table}".id
+            LIMIT %s
+        """
+        last_id = 0
+        while True:
+            self.env.cr.execute(statement, params + [last_id, self._bulk_size])
+            rows = self.env.cr.fetchall()
+            if not rows:
+                break
+            yield from rows
+            last_id = rows[-1][0]
+
+    def _reindex_documents(self):
+        """Send all stored documents to the Meilisearch index."""
+        self.ensure_one()
+        self.env[self.model]._update_documents(self, self._export_document_rows())
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Meilisearch Documents Sent"),
+                "message": _(
+                    "All documents have been sent to the Meilisearch index '%s'.",
+                    self.index_name,
+                ),
+                "sticky": False,
+                "type": "success",
+            },
+        }
+
+    def _read_record_documents(self, record_ids):
+        """Yield id, document and digest of the records from the database."""
+        self.ensure_one()
+        model = self.env[self.model]
+        model.flush_model(["index_document", "index_digest"])
+        query = sql.SQL(
+            "SELECT id, index_document, index_digest FROM {} WHERE id IN %s"
+        ).format(sql.Identifier(model._table))
+        for ids in split_every(self._bulk_size, sorted(record_ids)):
+            self.env.cr.execute(query, [ids])
+            yield from self.env.cr.fetchall()
+
+    def _sync_documents(self):
+        """Recompute the documents of the records modified since the last sync."""
+        self.ensure_one()
+        model = self.env[self.model]
+        model.flush_model(["write_date"])
+
+        # Skip recent changes as transactions may still commit older write dates
+        max_date = fields.Datetime.now() - timedelta(seconds=self._sync_margin)
+        statement = f"""
+            SELECT id, write_date
+            FROM "{model._table}"
+            WHERE write_date <= %s
+            AND (write_date, id) > (%s, %s)
+            ORDER BY write_date, id
+            LIMIT %s
+        """
+        if not self.sync_date:
+            self.write({"sync_date": max_date, "sync_id": 0})
+        last_date = self.sync_date
+        last_id = self.sync_id
+        count = 0
+        while True:
+            self.env.cr.execute(
+                statement, [max_date, last_date, last_id, self._bulk_size]
+            )
+            rows = self.env.cr.fetchall()
+            if not rows:
+                break
+            last_id, last_date = rows[-1]
+            count += len(rows)
+
+            # Queue the documents that changed or have not been indexed
+            for ids in split_every(models.PREFETCH_MAX, [row[0] for row in rows]):
+                model.browse(ids)._sync_index_documents(self)
+            self.write({"sync_date": last_date, "sync_id": last_id})
+            if not self.env.registry.in_test_mode():
+                self.env.cr.commit()  # Commit batch so the watermark is kept
+
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Meilisearch Documents Synced"),
+                "message": _("%s modified records have been checked.", count),
+                "sticky": False,
+                "type": "success",
+            },
+        }
+
+    def _check_all_documents(self):
+        """Compare the ids of the index and the records and update the result."""
+        self.ensure_one()
+        model = self.env[self.model]
+        if not self.get_client():
+            return
+        try:
+            document_ids = self._get_document_ids()
+        except Exception as e:
+            _logger.error("Could not fetch documents of index %s: %s", self.name, e)
+            return
+
+        # Records of other indexes keep the result of their index
+        record_ids = set(self._search_documents().ids)
+        indexed_ids = set(model.search([("index_result", "=", "indexed")]).ids)
+        not_found_ids = set(model.search([("index_result", "=", "not_found")]).ids)
+
+        # Only write records where the result changes
+        found_ids = (record_ids & document_ids) - indexed_ids
+        missing_ids = (record_ids - document_ids) - not_found_ids
+        for ids in split_every(self._bulk_size, sorted(found_ids)):
+            model.browse(ids).documents_indexed("Document found")
+        for ids in split_every(self._bulk_size, sorted(missing_ids)):
+            model.browse(ids)._write_index_results(
+                {"index_result": "not_found", "index_response": "Document not found"}
+            )
+
+    def _reconcile_documents(self, dry_run=False):
+        """Send missing and stale documents and delete orphaned documents."""
+        self.ensure_one()
+        model = self.env[self.model]
+        digest = model._get_index_document_digest
+        if not self.get_client():
+            return
+        try:
+            if self.reconcile_compare_content:
+                document_digests = {
+                    int(document.id): digest(vars(document))
+                    for document in self._iter_documents()
+                }
+            else:
+                document_digests = dict.fromkeys(self._get_document_ids())
+        except Exception as e:
+            raise UserError(
+                _("Could not fetch documents of index '%s': %s", self.index_name, e)
+            ) from None
+
+        # Compare the documents of the index with the records
+        record_ids = set(self._search_documents().ids)
+        missing_ids = record_ids - set(document_digests)
+        orphaned_ids = set(document_digests) - record_ids
+        stale_ids = set()
+        empty_ids = set()
+        if not self._uses_stored_documents():
+            # Documents prepared for the index are not stored and can't be compared
+            record_ids = set()
+        for res_id, document, sent_digest in self._read_record_documents(record_ids):
+            if not document:
+                empty_ids.add(res_id)
+                continue
+            if res_id in missing_ids:
+                continue
+            if self.reconcile_compare_content:
+                sent_digest = document_digests[res_id]
+            if sent_digest != digest(document):
+                stale_ids.add(res_id)
+
+        message = _(
+            "Missing documents: %s, stale documents: %s, orphaned documents: %s",
+            len(missing_ids),
+            len(stale_ids),
+            len(orphaned_ids),
+        )
+        _logger.info("Reconcile index %s: %s", self.name, message)
+
+        if dry_run:
+            title = _("Meilisearch Index Reconciliation (Dry Run)")
+        else:
+            title = _("Meilisearch Index Reconciliation")
+            # Documents without content are computed and queued
+            if empty_ids:
+                model.browse(sorted(empty_ids)).update_index_document()
+            for ids in split_every(
+                self._bulk_size, sorted((missing_ids | stale_ids) - empty_ids)
+            ):
+                model.browse(ids)._update_documents(self)
+            self._delete_document_ids(sorted(orphaned_ids))
+
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": title,
+                "message": message,
+                "sticky": True,
+                "type": "info" if dry_run else "success",
+            },
+        }
+
+    def _delete_document_ids(self, document_ids):
+        """Delete the documents with the given ids from the Meilisearch index."""
+        self.ensure_one()
+        client = self.get_client()
+        if not client:
+            return
+        for ids in split_every(self._bulk_size, document_ids, list):
+            res = client.index(self.index_name).delete_documents(ids)
+            self.env[self.model].browse(ids)._clear_index_digests()
+            if self.create_task:
+                self.env["meilisearch.task"].create(
+                    {
+                        "name": "documentDeletion",
+                        "index_id": self.id,
+                        "uid": res.task_uid,
+                        "document_ids": ids,
+                    }
+                )
+
+    def _search_document_ids(self, query, complete=False):
+        """Return the matching ids by relevance or None if the limit is reached."""
+        self.ensure_one()
+        params = {"limit": self._search_limit, "attributesToRetrieve": ["id"]}
+        res = self.get_client().index(self.index_name).search(query, params)
+        total = max(res.get("estimatedTotalHits", 0), len(res["hits"]))
+        # Callers that need all matches can not use a truncated result
+        if complete and total >= self._search_limit:
+            return None
+        return [int(hit["id"]) for hit in res["hits"]]
+
+    def _search_api(self, query, limit=20, offset=0):
+        """Return the documents matching the query that the user can read."""
+        self.ensure_one()
+        index = self.sudo()
+        if not isinstance(query, str):
+            raise UserError(_("The search query must be a string."))
+        try:
+            limit, offset = int(limit), int(offset)
+        except (TypeError, ValueError):
+            raise UserError(_("The limit and offset must be integers.")) from None
+        if not 0 < limit <= self._search_api_limit or offset < 0:
+            raise UserError(
+                _(
+                    "The limit must be between 1 and %s and the offset must not "
+                    "be negative.",
+                    self._search_api_limit,
+                )
+            )
+
+        client = index.get_client()
+        if not client:
+            raise UserError(_("The Meilisearch client is not configured."))
+
+        # Share the Meilisearch results between users and workers
+        key = (self.env.cr.dbname, index.id, index.search_version, query)
+        hits = search_cache.get(key)
+        if hits is None:
+            res = client.index(index.index_name).search(
+                query, {"limit": self._search_limit}
+            )
+            hits = res["hits"]
+            search_cache.set(key, hits)
+
+        # Apply the access rights and record rules of the user
+        model = self.env[index.model]
+        model.check_access_rights("read")
+        found_ids = set(model._search([("id", "in", [int(h["id"]) for h in hits])]))
+        hits = [hit for hit in hits if int(hit["id"]) in found_ids]
+        return {
+            "query": query,
+            "hits": hits[offset : offset + limit],
+            "offset": offset,
+            "limit": limit,
+            "estimatedTotalHits": len(hits),
+        }
+
+    def _invalidate_search_cache(self):
+        """Expire the cached search results of the indexes in all workers."""
+        if not self:
+            return
+        # Use SQL to keep the write date and the ORM caches of the indexes
+        self.flush_recordset(["search_version"])
+        self.env.cr.execute(
+            "UPDATE meilisearch_index SET search_version = search_version + 1 "
+            "WHERE id IN %s",
+            [tuple(self.ids)],
+        )
+        self.invalidate_recordset(["search_version"])
+
+    def _uses_stored_documents(self):
+        """Return whether the stored documents can be sent to this index."""
+        self.ensure_one()
+        return not self.lang
+
+    def _get_index_domain(self):
+        """Return the document domain configured on the index."""
+        self.ensure_one()
+        return safe_eval(self.document_domain or "[]")
+
+    def _get_document_domain(self):
+        """Return the domain of the records that belong to this index."""
+        self.ensure_one()
+        model = self.env[self.model]
+        return model._get_index_document_domain() + self._get_index_domain()
+
+    def _search_documents(self):
+        """Return all records that belong to this index."""
+        self.ensure_one()
+        model = self.env[self.model]
+        records = model.search(self._get_document_domain())
+        if model._has_index_document_filter():
+            records = records.filtered(model._get_index_document_filter())
+        return records
+
     def _get_all_documents(self):
         self.ensure_one()
         return self.env[self.model].search([])
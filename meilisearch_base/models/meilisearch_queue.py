@@ -0,0 +1,88 @@
+import logging
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+
+class MeilisearchQueue(models.Model):
+    _name = "meilisearch.queue"
+    _description = "Meilisearch Queue"
+    _order = "id"
+    _batch_size = 1000
+    _delay = 10
+    _max_attempts = 10
+
+    index_id = fields.Many2one(
+        "meilisearch.index", required=True, index=True, ondelete="cascade"
+    )
+    model = fields.Char(related="index_id.model")
+    res_id = fields.Integer("Document ID", required=True, index=True)
+    operation = fields.Selection(
+        [("update", "Update"), ("delete", "Delete")],
+        required=True,
+        default="update",
+    )
+    attempts = fields.Integer(help="Number of failed attempts to send the document.")
+
+    def name_get(self):
+        res = []
+        for entry in self:
+            res.append(
+                (
+                    entry.id,
+                    _("%s (%s)") % (entry.index_id.model, entry.res_id),
+                )
+            )
+        return res
+
+    @api.model
+    def _flush_pending(self):
+        """Create the queue entries collected in the current transaction."""
+        pending = self.env.cr.precommit.data.pop("meilisearch.queue", {})
+        vals_list = []
+        for index_id, operations in pending.items():
+            # Overwrite the operation of documents already waiting in the queue
+            entries = self.search(
+                [("index_id", "=", index_id), ("res_id", "in", list(operations))]
+            )
+            for operation in ("update", "delete"):
+                entries.filtered(
+                    lambda e: e.operation != operation
+                    and operations[e.res_id] == operation
+                ).write({"operation": operation})
+            queued_ids = set(entries.mapped("res_id"))
+            vals_list += [
+                {"index_id": index_id, "res_id": res_id, "operation": operation}
+                for res_id, operation in sorted(operations.items())
+                if res_id not in queued_ids
+            ]
+        if vals_list:
+            self.create(vals_list)
+            # Delay the cron job so that following updates are sent together
+            self.env.ref("meilisearch_base.ir_cron_meilisearch_queue")._trigger(
+                at=fields.Datetime.now() + timedelta(seconds=self._delay)
+            )
+            self.env.flush_all()
+
+    def _retry(self):
+        """Count a failed attempt and drop the entries that reached the limit."""
+        retry_entries = self.filtered(lambda e: e.attempts + 1 < self._max_attempts)
+        for entry in retry_entries:
+            entry.attempts += 1
+        (self - retry_entries).unlink()
+
+    @api.model
+    def _cron_process_queue(self):
+        # Get all active indexes
+        for index in self.env["meilisearch.index"].search(
+            [
+                ("active", "=", True),
+                "|",
+                ("database_filter", "=", False),
+                ("database_filter", "=", self._cr.dbname),
+            ]
+        ):
+            _logger.info("Processing queue for index: %s", index.name)
+            index._process_queue()
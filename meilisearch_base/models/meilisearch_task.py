@@ -1,8 +1,9 @@
+import json
 import logging
 from datetime import timedelta
 
 from odoo import _, api, fields, models
-from odoo.tools.safe_eval import safe_eval
+from odoo.tools import split_every, sql
 
 _logger = logging.getLogger(__name__)
 
@@ -11,9 +12,18 @@ class MeilisearchTask(models.Model):
     _name = "meilisearch.task"
     _description = "Meilisearch Task"
     _order = "uid desc"
+    _poll_size = 500
+    _gc_chunk_size = 1000
+    _sql_constraints = [
+        (
+            "index_uid_unique",
+            "unique(index_id, uid)",
+            "The task uid must be unique per index.",
+        )
+    ]
 
     name = fields.Char(required=True)
-    uid = fields.Integer("UID", required=True)
+    uid = fields.Integer("UID", required=True, index=True)
     status = fields.Selection(
         [
             ("enqueued", "Enqued"),
@@ -25,8 +35,36 @@ class MeilisearchTask(models.Model):
         required=True,
     )
     response = fields.Text()
-    index_id = fields.Many2one("meilisearch.index", required=True)
-    document_ids = fields.Char(help="Comma separated list of document ids.")
+    index_id = fields.Many2one("meilisearch.index", required=True, index=True)
+    document_ids = fields.Json(help="Stores the list of document ids as JSONB.")
+    document_ids_read = fields.Text(
+        string="Document IDs",
+        compute="_compute_document_ids_read",
+        help="Returns the list of document ids.",
+    )
+
+    def init(self):
+        # Index the creation date per index for the garbage collection
+        index_name = "meilisearch_task_index_id_create_date_index"
+        if not sql.index_exists(self._cr, index_name):
+            sql.create_index(
+                self._cr, index_name, self._table, ["index_id", "create_date"]
+            )
+
+        # Index the document ids to find the tasks of a document
+        index_name = "meilisearch_task_document_ids_index"
+        if not sql.index_exists(self._cr, index_name):
+            sql.create_index(
+                self._cr,
+                index_name,
+                self._table,
+                ["document_ids jsonb_path_ops"],
+                method="gin",
+            )
+
+    def _compute_document_ids_read(self):
+        for task in self:
+            task.document_ids_read = json.dumps(task.document_ids)
 
     def name_get(self):
         res = []
@@ -41,10 +79,8 @@ class MeilisearchTask(models.Model):
 
     def _get_document_ids(self):
         self.ensure_one()
-        document_ids = self.env[self.index_id.model].browse(
-            safe_eval(self.document_ids)
-        )
-        return document_ids
+        document_ids = self.env[self.index_id.model].browse(self.document_ids or [])
+        return document_ids.exists()
 
     def button_check_task(self):
         self.ensure_one()
@@ -68,40 +104,119 @@ class MeilisearchTask(models.Model):
                 "edit": False,
             },
             "search_view_id": [search_view_id.id, "search"],
-            "domain": [("id", "in", safe_eval(self.document_ids))],
+            "domain": [("id", "in", self.document_ids or [])],
         }
 
+    def _get_documents_by_model(self):
+        """Return the documents of all tasks grouped by model."""
+        document_ids = {}
+        for task in self:
+            document_ids.setdefault(task.index_id.model, set()).update(
+                task.document_ids or []
+            )
+        return {
+            model: self.env[model].browse(sorted(ids)).exists()
+            for model, ids in document_ids.items()
+        }
+
+    @api.model
+    def _get_document_tasks(self, index, res_id):
+        """Return the tasks of the index that contain the document id."""
+        self.flush_model(["index_id", "document_ids"])
+        self._cr.execute(
+            """
+            SELECT id FROM meilisearch_task
+            WHERE index_id = %s AND document_ids @> %s::jsonb
+            ORDER BY uid DESC
+            """,
+            [index.id, json.dumps([res_id])],
+        )
+        return self.browse([row[0] for row in self._cr.fetchall()])
+
     def task_succeeded(self):
-        self.ensure_one()
         self.write(
             {
                 "status": "succeeded",
                 "response": "Task succeeded",
             }
         )
-        if self.name == "documentAdditionOrUpdate":
-            document_ids = self._get_document_ids()
-            document_ids.documents_indexed("Task succeeded")
+        self.index_id._invalidate_search_cache()
+        tasks = self.filtered(lambda t: t.name == "documentAdditionOrUpdate")
+        for documents in tasks._get_documents_by_model().values():
+            documents.documents_indexed("Task succeeded")
 
     def task_failed(self):
-        self.ensure_one()
         self.write(
             {
                 "status": "failed",
                 "response": "Task failed",
             }
         )
-        documents = self._get_document_ids()
-        documents.write({"index_result": "error", "index_response": "Task failed"})
+        for documents in self._get_documents_by_model().values():
+            documents._write_index_results(
+                {"index_result": "error", "index_response": "Task failed"}
+            )
+
+    @api.model
+    def _apply_task_statuses(self, statuses):
+        """Update the tasks from a dict of status by uid and return unknown uids."""
+        tasks = self.search([("uid", "in", list(statuses))])
+        unknown_uids = set(statuses) - set(tasks.mapped("uid"))
+
+        # Skip tasks that already have the status
+        tasks = tasks.filtered(lambda t: t.status != statuses[t.uid])
+        tasks.filtered(lambda t: statuses[t.uid] == "succeeded").task_succeeded()
+        tasks.filtered(lambda t: statuses[t.uid] == "failed").task_failed()
+        return unknown_uids
 
     def fetch_status(self, client):
         self.ensure_one()
         index_task = client.get_task(self.uid)
         self.write({"status": index_task.status, "response": index_task})
 
+    @api.model
+    def _cron_poll_tasks(self):
+        """Fetch the status of pending tasks from Meilisearch in pages."""
+        tasks = self.search(
+            [
+                ("status", "in", ["enqueued", "processing"]),
+                ("create_date", "<", fields.Datetime.now() - timedelta(minutes=5)),
+            ],
+            order="uid",
+        )
+        client = self.env["meilisearch.index"].get_client()
+        if not tasks or not client:
+            return
+
+        for uids in split_every(self._poll_size, tasks.mapped("uid")):
+            res = client.get_tasks(
+                {
+                    "uids": ",".join(str(uid) for uid in uids),
+                    "statuses": "succeeded,failed,canceled",
+                    "limit": len(uids),
+                }
+            )
+            statuses = {
+                task.uid: "failed" if task.status == "canceled" else task.status
+                for task in res.results
+            }
+            self._apply_task_statuses(statuses)
+            if not self.env.registry.in_test_mode():
+                self.env.cr.commit()  # Commit the updated tasks
+
+    def _unlink_in_chunks(self, domain):
+        """Delete the matching tasks in chunks and commit after each chunk."""
+        while True:
+            tasks = self.search(domain, limit=self._gc_chunk_size)
+            if not tasks:
+                break
+            tasks.unlink()
+            if not self.env.registry.in_test_mode():
+                self.env.cr.commit()  # Release the locks of the deleted tasks
+
     @api.autovacuum
     def _gc_meilisearch_tasks(self):
-        """Delete tasks from active indexes after one day."""
+        """Delete tasks from active indexes according to the index retention."""
 
         # Get all active indexes
         index_ids = self.env["meilisearch.index"].search(
@@ -112,10 +227,28 @@ class MeilisearchTask(models.Model):
                 ("database_filter", "=", self._cr.dbname),
             ]
         )
-        unlink_task_ids = self.env["meilisearch.task"].search(
-            [
-                ("index_id", "in", index_ids.ids),
-                ("create_date", "<", fields.Datetime.now() - timedelta(days=1)),
-            ]
-        )
-        unlink_task_ids.unlink()
+        for index in index_ids:
+            if index.task_retention_days:
+                self._unlink_in_chunks(
+                    [
+                        ("index_id", "=", index.id),
+                        (
+                            "create_date",
+                            "<",
+                            fields.Datetime.now()
+                            - timedelta(days=index.task_retention_days),
+                        ),
+                    ]
+                )
+            if index.task_retention_count:
+                # Get the newest task that exceeds the max number of tasks
+                task = self.search(
+                    [("index_id", "=", index.id)],
+                    order="uid desc",
+                    offset=index.task_retention_count,
+                    limit=1,
+                )
+                if task:
+                    self._unlink_in_chunks(
+                        [("index_id", "=", index.id), ("uid", "<=", task.uid)]
+                    )
@@ -9,14 +9,29 @@ class Country(models.Model):
     _name = "res.country"
     _inherit = ["res.country", "meilisearch.document.mixin"]
 
-    def _prepare_index_document(self):
-        document = super()._prepare_index_document()
-        document["code"] = self.code
-        document["currency_name"] = self.currency_id.name
-        return document
-
-    def _get_index_document_filter(self):
-        return lambda r: r.code != "CH"
+    def _prepare_index_documents(self):
+        documents = super()._prepare_index_documents()
+        # Read the currency names of all countries at once
+        currency_names = {currency.id: currency.name for currency in self.currency_id}
+        for record in self:
+            documents[record.id]["code"] = record.code
+            documents[record.id]["currency_name"] = currency_names.get(
+                record.currency_id.id
+            )
+        return documents
+
+    @api.model
+    def _name_search(
+        self, name, args=None, operator="ilike", limit=100, name_get_uid=None
+    ):
+        # The name search of res.country is resolved before the one of the mixin
+        ids = self._name_search_index(name, args, operator, limit, name_get_uid)
+        if ids is None:
+            return super()._name_search(name, args, operator, limit, name_get_uid)
+        return ids
+
+    def _get_index_document_domain(self):
+        return [("code", "!=", "CH")]
 
     @api.depends("code", "currency_id.name")
     def _compute_index_document(self):
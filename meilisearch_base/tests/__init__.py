@@ -0,0 +1,4 @@
+from . import test_meilisearch_task
+from . import test_meilisearch_name_search
+from . import test_meilisearch_event
+from . import test_meilisearch_search_api
@@ -0,0 +1,53 @@
+import json
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase
+
+
+class TestMeilisearchEvent(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.index_id = cls.env["meilisearch.index"].create(
+            {
+                "name": "Events",
+                "index_name": "events",
+                "model_id": cls.env.ref("base.model_res_country").id,
+            }
+        )
+        cls.task_id = cls.env["meilisearch.task"].create(
+            {"name": "documentAdditionOrUpdate", "uid": 1, "index_id": cls.index_id.id}
+        )
+
+    def test_invalid_event_does_not_block(self):
+        Event = self.env["meilisearch.event"]
+        invalid_event = Event.create({"payload": "not json"})
+        missing_event = Event.create({"payload": json.dumps({"uid": 2})})
+        valid_event = Event.create(
+            {"payload": json.dumps({"uid": 1, "status": "succeeded"})}
+        )
+
+        Event._cron_process_events()
+
+        self.assertEqual(invalid_event.state, "failed")
+        self.assertEqual(missing_event.state, "failed")
+        self.assertEqual(valid_event.state, "done")
+        self.assertEqual(self.task_id.status, "succeeded")
+
+    def test_event_error_is_retried(self):
+        Event = self.env["meilisearch.event"]
+        event = Event.create({"payload": json.dumps({"uid": 1, "status": "succeeded"})})
+
+        with patch.object(
+            self.env.registry["meilisearch.task"],
+            "_apply_task_statuses",
+            side_effect=Exception("Lock timeout"),
+        ):
+            Event._cron_process_events()
+        self.assertEqual(event.state, "pending")
+        self.assertEqual(event.attempts, 1)
+
+        Event._cron_process_events()
+        self.assertEqual(event.state, "done")
+        self.assertEqual(self.task_id.status, "succeeded")
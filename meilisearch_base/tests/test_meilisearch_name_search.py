@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock, patch
+
+from odoo.tests.common import TransactionCase
+
+
+class TestMeilisearchNameSearch(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.index_id = cls.env["meilisearch.index"].create(
+            {
+                "name": "Countries Name Search",
+                "index_name": "countries_name_search",
+                "active": True,
+                "name_search": True,
+                "full_text_search": True,
+                "model_id": cls.env.ref("base.model_res_country").id,
+            }
+        )
+        cls.germany = cls.env.ref("base.de")
+        cls.france = cls.env.ref("base.fr")
+        cls.Index = cls.env.registry["meilisearch.index"]
+
+    def test_name_search_uses_index(self):
+        with patch.object(
+            self.Index,
+            "_search_document_ids",
+            return_value=[self.france.id, self.germany.id],
+        ) as search_document_ids:
+            res = self.env["res.country"].name_search("Frnce")
+        search_document_ids.assert_called_once_with("Frnce")
+        self.assertEqual([r[0] for r in res], [self.france.id, self.germany.id])
+
+    def test_name_search_applies_domain(self):
+        with patch.object(
+            self.Index,
+            "_search_document_ids",
+            return_value=[self.france.id, self.germany.id],
+        ):
+            res = self.env["res.country"].name_search(
+                "Frnce", args=[("code", "=", "DE")]
+            )
+        self.assertEqual([r[0] for r in res], [self.germany.id])
+
+    def test_name_search_falls_back_to_sql(self):
+        with patch.object(
+            self.Index, "_search_document_ids", side_effect=Exception("Down")
+        ):
+            res = self.env["res.country"].name_search("France")
+        self.assertIn(self.france.id, [r[0] for r in res])
+
+    def test_full_text_search_uses_index(self):
+        with patch.object(
+            self.Index, "_search_document_ids", return_value=[self.france.id]
+        ):
+            domain = self.env["res.country"]._get_index_search_domain(
+                [("name", "ilike", "Frnce")]
+            )
+        self.assertEqual(domain, [("id", "in", [self.france.id])])
+
+    def test_full_text_search_falls_back_at_limit(self):
+        client = MagicMock()
+        client.index.return_value.search.return_value = {
+            "hits": [{"id": self.france.id}],
+            "estimatedTotalHits": self.index_id._search_limit,
+        }
+        with patch.object(self.Index, "get_client", return_value=client):
+            domain = self.env["res.country"]._get_index_search_domain(
+                [("name", "ilike", "a")]
+            )
+        self.assertEqual(domain, [("name", "ilike", "a")])
@@ -0,0 +1,30 @@
+from odoo.exceptions import UserError
+from odoo.tests.common import TransactionCase
+
+
+class TestMeilisearchSearchApi(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.index_id = cls.env["meilisearch.index"].create(
+            {
+                "name": "Countries Search API",
+                "index_name": "countries_search_api",
+                "search_api": True,
+                "model_id": cls.env.ref("base.model_res_country").id,
+            }
+        )
+
+    def test_search_api_rejects_invalid_params(self):
+        for query, limit, offset in [
+            (["France"], 20, 0),
+            ("France", "many", 0),
+            ("France", None, 0),
+            ("France", 0, 0),
+            ("France", -1, 0),
+            ("France", self.index_id._search_api_limit + 1, 0),
+            ("France", 20, -1),
+        ]:
+            with self.assertRaises(UserError):
+                self.index_id._search_api(query, limit, offset)
@@ -0,0 +1,72 @@
+import logging
+import time
+
+from psycopg2 import IntegrityError
+
+from odoo.tests.common import TransactionCase, tagged
+from odoo.tools import mute_logger
+
+_logger = logging.getLogger(__name__)
+
+
+class TestMeilisearchTaskCommon(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.index_id = cls.env["meilisearch.index"].create(
+            {
+                "name": "Tasks",
+                "index_name": "tasks",
+                "model_id": cls.env.ref("base.model_res_country").id,
+            }
+        )
+
+    def _insert_tasks(self, start, stop):
+        self.env.cr.execute(
+            """
+            INSERT INTO meilisearch_task
+                (name, uid, status, index_id, create_date, write_date)
+            SELECT 'documentAdditionOrUpdate', uid, 'succeeded', %s, now(), now()
+            FROM generate_series(%s, %s) AS uid
+            """,
+            [self.index_id.id, start, stop],
+        )
+        self.env.cr.execute("ANALYZE meilisearch_task")
+
+
+class TestMeilisearchTask(TestMeilisearchTaskCommon):
+    def test_task_uid_unique_per_index(self):
+        self._insert_tasks(1, 10)
+        with self.assertRaises(IntegrityError), mute_logger("odoo.sql_db"):
+            with self.env.cr.savepoint():
+                self._insert_tasks(10, 10)
+
+
+@tagged("-standard", "meilisearch_benchmark")
+class TestMeilisearchTaskBenchmark(TestMeilisearchTaskCommon):
+    def _measure_lookup(self, uids):
+        Task = self.env["meilisearch.task"]
+        start = time.perf_counter()
+        for uid in uids:
+            Task.search([("uid", "=", uid)])
+        return time.perf_counter() - start
+
+    def test_task_lookup_by_uid(self):
+        self._insert_tasks(1, 1000)
+        small_time = self._measure_lookup(range(1, 1000, 10))
+
+        self._insert_tasks(1001, 2000000)
+        large_time = self._measure_lookup(range(1000001, 1001000, 10))
+        _logger.info(
+            "Task lookup with 1000 rows: %.4fs, with 2000000 rows: %.4fs",
+            small_time,
+            large_time,
+        )
+
+        self.env.cr.execute(
+            "EXPLAIN SELECT id FROM meilisearch_task WHERE uid = %s", [1500000]
+        )
+        plan = "\n".join(row[0] for row in self.env.cr.fetchall())
+        self.assertIn("Index", plan, plan)
+        self.assertLess(large_time, small_time * 5)